@@ -2,12 +2,14 @@ import asyncio
 import os
 import re
 import random
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple, Dict, Set, TextIO
 
 import click
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Error as PlaywrightError
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route, Error as PlaywrightError
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 
 BASE_URL = "https://legalacts.ru"
@@ -15,6 +17,41 @@ LEFT_BLOCK_SELECTOR = "div.p-2.main-left-block.col-12.col-lg-2"
 CENTER_BLOCK_SELECTOR = "div.main-center-block.col-12.col-lg-8"
 CODES_LIST_SELECTOR = "div.main-center-block-linkslist-noleft.ps-0"
 ARTICLE_TEXT_SELECTOR = "div.main-center-block-article-text"
+# Formatted entries buffered by the writer before each writelines() call
+WRITE_BATCH_SIZE = 32
+
+INLINE_WHITESPACE_RE = re.compile(r"\s+")
+DATE_RE = re.compile(r"\b(\d{2}\.\d{2}\.\d{4})\b")
+TOC_KEYWORDS = ("Раздел", "Глава", "Статья")
+# Fast path for the common "<Keyword> <number>[.:)] <name>" titles; anything else goes through parse_title_number_and_name
+TOC_HEADING_RE = re.compile(r"^(Раздел|Глава|Статья)\s+([IVXLCDM]+|\d+(?:[.\-]\d+)*)(?:[.:)]\s*|\s+|$)(.*)$", re.IGNORECASE)
+# Roman numerals or decimal numbers with optional dots/hyphens (e.g., 241.2, 12.1-1)
+TITLE_NUMBER_RE = re.compile(r"^([IVXLCDM]+|\d+(?:[.\-]\d+)*)[\.:\)]\s*(.*)$", re.IGNORECASE)
+# Whole navigation lines ("<", ">", "Статья N. ...") including their line break; expects stripped lines
+NAV_LINE_RE = re.compile(r"^(?:<|>|Статья[^\S\n]+(?:\d+|[IVXLCDM]+)(?:[.:]|[^\S\n])).*\n?", re.MULTILINE)
+LINE_BREAK_RE = re.compile(r"\r\n|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+LINE_EDGE_WHITESPACE_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+PARAGRAPH_TAGS = {"p": 2, "h1": 2, "h2": 2, "h3": 2, "h4": 2, "h5": 2, "h6": 2}
+BLOCK_TAGS = {
+    "div", "section", "article", "header", "footer", "blockquote", "pre",
+    "ul", "ol", "li", "dl", "dt", "dd", "table", "tr", "caption",
+}
+
+# Only the HTML carries the text we extract; everything else is dead weight on each page load
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = ("mc.yandex.ru", "google-analytics.com", "googletagmanager.com", "top-fwz1.mail.ru")
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+)
+# One generator per process, shared by delays, humanization and browser fingerprint choices.
+# Forked workers would otherwise inherit the parent's state and draw identical sequences.
+RNG = random.Random()
+os.register_at_fork(after_in_child=RNG.seed)
 
 
 @dataclass
@@ -29,34 +66,29 @@ class ArticleMeta:
 
 
 def random_user_agent() -> str:
-    user_agents = [
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-    ]
-    return random.choice(user_agents)
+    return RNG.choice(USER_AGENTS)
 
 
 async def human_delay(min_seconds: float, max_seconds: float) -> None:
-    await asyncio.sleep(random.uniform(min_seconds, max_seconds))
+    await asyncio.sleep(RNG.uniform(min_seconds, max_seconds))
 
 
 async def humanize_page(page: Page, min_delay: float, max_delay: float) -> None:
-    width = random.randint(1200, 1600)
-    height = random.randint(800, 1000)
+    width = RNG.randint(1200, 1600)
+    height = RNG.randint(800, 1000)
     try:
         await page.set_viewport_size({"width": width, "height": height})
     except Exception:
         pass
 
     try:
-        for _ in range(random.randint(2, 4)):
-            x = random.randint(50, width - 50)
-            y = random.randint(100, height - 100)
-            await page.mouse.move(x, y, steps=random.randint(10, 30))
+        for _ in range(RNG.randint(2, 4)):
+            x = RNG.randint(50, width - 50)
+            y = RNG.randint(100, height - 100)
+            await page.mouse.move(x, y, steps=RNG.randint(10, 30))
             await human_delay(min_delay, max_delay)
-        for _ in range(random.randint(2, 4)):
-            delta = random.randint(200, 600)
+        for _ in range(RNG.randint(2, 4)):
+            delta = RNG.randint(200, 600)
             await page.mouse.wheel(0, delta)
             await human_delay(min_delay, max_delay)
     except Exception:
@@ -72,6 +104,12 @@ def slug_from_href(href: str) -> str:
     return parts[1] if len(parts) > 1 else parts[-1]
 
 
+async def wait_for_selector_if_missing(page: Page, selector: str, timeout: int = 30000) -> None:
+    # After a domcontentloaded goto the node is usually there already; only poll when it is not
+    if await page.query_selector(selector) is None:
+        await page.wait_for_selector(selector, timeout=timeout)
+
+
 async def get_text_or_empty(page: Page, selector: str) -> str:
     try:
         locator = page.locator(selector)
@@ -82,11 +120,55 @@ async def get_text_or_empty(page: Page, selector: str) -> str:
         return ""
 
 
+def html_inner_text(node: LexborNode) -> str:
+    # Approximates Element.innerText: inline whitespace collapses, block elements break lines
+    chunks: List[str] = []
+    pending_breaks = 0
+
+    def walk(parent: LexborNode) -> None:
+        nonlocal pending_breaks
+        for child in parent.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                text = INLINE_WHITESPACE_RE.sub(" ", child.text_content or "")
+                if pending_breaks and text.strip():
+                    if chunks:
+                        chunks.append("\n" * pending_breaks)
+                    pending_breaks = 0
+                chunks.append(text)
+            elif tag == "br":
+                chunks.append("\n")
+            elif tag in SKIPPED_TAGS:
+                continue
+            else:
+                breaks = PARAGRAPH_TAGS.get(tag, 1 if tag in BLOCK_TAGS else 0)
+                pending_breaks = max(pending_breaks, breaks)
+                walk(child)
+                pending_breaks = max(pending_breaks, breaks)
+
+    walk(node)
+    text = "".join(chunks)
+    return "\n".join(ln.strip() for ln in text.split("\n")).strip()
+
+
 def find_date_in_text(text: str) -> str:
-    dates = re.findall(r"\b(\d{2}\.\d{2}\.\d{4})\b", text)
+    dates = DATE_RE.findall(text)
     return dates[-1] if dates else ""
 
 
+def classify_toc_heading(text: str) -> Optional[Tuple[str, str, str]]:
+    # Returns (lowercased keyword, number, name) for section/chapter/article titles
+    m = TOC_HEADING_RE.match(text)
+    if m:
+        return m.group(1).lower(), m.group(2), m.group(3).strip()
+    lower = text.lower()
+    for keyword in TOC_KEYWORDS:
+        if lower.startswith(keyword.lower()):
+            number, name = parse_title_number_and_name(text, keyword)
+            return keyword.lower(), number, name
+    return None
+
+
 def parse_title_number_and_name(title: str, keyword: str) -> Tuple[str, str]:
     t = title.strip()
     number = ""
@@ -94,8 +176,7 @@ def parse_title_number_and_name(title: str, keyword: str) -> Tuple[str, str]:
     try:
         if t.lower().startswith(keyword.lower()):
             rest = t[len(keyword):].strip()
-            # Support Roman numerals or decimal numbers with optional dots/hyphens (e.g., 241.2, 12.1-1)
-            m = re.match(r"^([IVXLCDM]+|\d+(?:[.\-]\d+)*)[\.:\)]\s*(.*)$", rest, re.IGNORECASE)
+            m = TITLE_NUMBER_RE.match(rest)
             if m:
                 number, name = m.group(1).strip(), m.group(2).strip()
             else:
@@ -118,38 +199,77 @@ async def goto_with_retry(page: Page, url: str) -> None:
     await page.goto(url, timeout=45000, wait_until="domcontentloaded")
 
 
-async def extract_codes_from_home(page: Page, min_delay: float, max_delay: float) -> List[Tuple[str, str]]:
+@retry(
+    reraise=True,
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=6),
+    retry=retry_if_exception_type(PlaywrightError),
+)
+async def fetch_html_with_retry(context: BrowserContext, url: str) -> Optional[str]:
+    # Plain HTTP through the context (shares cookies and user agent), no rendering.
+    # Throttling and server errors are retried with backoff; None means the page is not there.
+    resp = await context.request.get(url, timeout=45000)
+    if resp.status == 429 or resp.status >= 500:
+        raise PlaywrightError(f"status {resp.status} for {url}")
+    if not resp.ok:
+        return None
+    return await resp.text()
+
+
+async def extract_codes_from_home(page: Page, min_delay: float, max_delay: float, stealth: bool = False) -> List[Tuple[str, str]]:
     await goto_with_retry(page, BASE_URL + "/kodeksy/")
-    await page.wait_for_selector(CODES_LIST_SELECTOR, timeout=30000)
-    await humanize_page(page, min_delay, max_delay)
+    await wait_for_selector_if_missing(page, CODES_LIST_SELECTOR)
+    if stealth:
+        await humanize_page(page, min_delay, max_delay)
 
-    links = await page.eval_on_selector_all(
-        f"{CODES_LIST_SELECTOR} a",
-        "els => els.map(a => ({href: a.getAttribute('href'), text: a.textContent?.trim() || ''}))",
-    )
+    tree = LexborHTMLParser(await page.content())
     code_links: List[Tuple[str, str]] = []
-    for item in links:
-        href = item.get("href") or ""
-        text = item.get("text") or ""
+    for a in tree.css(f"{CODES_LIST_SELECTOR} a"):
+        href = a.attributes.get("href") or ""
+        text = a.text().strip()
         if href.startswith("/kodeks/") and text:
             code_links.append((text, href))
     return code_links
 
 
-async def extract_toc_items(page: Page, min_delay: float, max_delay: float) -> List[Dict[str, str]]:
-    await page.wait_for_selector(CENTER_BLOCK_SELECTOR, timeout=30000)
-    await humanize_page(page, min_delay, max_delay)
-
-    items = await page.eval_on_selector_all(
-        f"{CENTER_BLOCK_SELECTOR} p.text-start",
-        "els => els.map(p => ({cls: p.className, href: p.querySelector('a')?.getAttribute('href') || '', text: p.querySelector('a')?.textContent?.trim() || ''}))",
-    )
+def parse_toc_items(html: str) -> List[Dict[str, str]]:
+    tree = LexborHTMLParser(html)
+    items: List[Dict[str, str]] = []
+    for p in tree.css(f"{CENTER_BLOCK_SELECTOR} p.text-start"):
+        a = p.css_first("a")
+        items.append({
+            "cls": p.attributes.get("class") or "",
+            "href": (a.attributes.get("href") or "") if a is not None else "",
+            "text": a.text().strip() if a is not None else "",
+        })
     return items
 
 
-async def extract_article_text_and_date(page: Page, min_delay: float, max_delay: float) -> Tuple[str, str]:
-    await page.wait_for_selector(ARTICLE_TEXT_SELECTOR, timeout=30000)
-    await humanize_page(page, min_delay, max_delay)
+async def extract_toc_items(page: Page, min_delay: float, max_delay: float, stealth: bool = False) -> List[Dict[str, str]]:
+    await wait_for_selector_if_missing(page, CENTER_BLOCK_SELECTOR)
+    if stealth:
+        await humanize_page(page, min_delay, max_delay)
+
+    return parse_toc_items(await page.content())
+
+
+def parse_article_html(html: str) -> Optional[Tuple[str, str]]:
+    tree = LexborHTMLParser(html)
+    article_node = tree.css_first(ARTICLE_TEXT_SELECTOR)
+    if article_node is None:
+        return None
+
+    article_text = clean_article_text(html_inner_text(article_node))
+    center_node = tree.css_first("div.main-center-block")
+    updated_at = find_date_in_text(html_inner_text(center_node)) if center_node is not None else ""
+
+    return article_text.strip(), updated_at
+
+
+async def extract_article_text_and_date(page: Page, min_delay: float, max_delay: float, stealth: bool = False) -> Tuple[str, str]:
+    await wait_for_selector_if_missing(page, ARTICLE_TEXT_SELECTOR)
+    if stealth:
+        await humanize_page(page, min_delay, max_delay)
 
     article_text = await get_text_or_empty(page, ARTICLE_TEXT_SELECTOR)
     article_text = clean_article_text(article_text)
@@ -159,31 +279,59 @@ async def extract_article_text_and_date(page: Page, min_delay: float, max_delay:
     return article_text.strip(), updated_at
 
 
-async def write_article(output_path: str, meta: ArticleMeta, article_text: str) -> None:
-    with open(output_path, "a", encoding="utf-8") as f:
-        lines = []
-        if meta.section_number:
-            lines.append(f"[section_number] {meta.section_number}\n")
-        if meta.section_name:
-            lines.append(f"[section_name] {meta.section_name}\n")
-        if meta.chapter_number:
-            lines.append(f"[chapter_number] {meta.chapter_number}\n")
-        if meta.chapter_name:
-            lines.append(f"[chapter_name] {meta.chapter_name}\n")
-        if meta.article_number:
-            lines.append(f"[article_number] {meta.article_number}\n")
-        if meta.article_name:
-            lines.append(f"[article_name] {meta.article_name}\n")
-        if meta.updated_at:
-            lines.append(f"[updated_at] {meta.updated_at}\n")
-
-        for ln in lines:
-            f.write(ln)
-        if lines:
-            f.write("\n")
-
-        f.write(article_text)
-        f.write("\n\n")
+def format_article(meta: ArticleMeta, article_text: str) -> str:
+    fields = (
+        ("section_number", meta.section_number),
+        ("section_name", meta.section_name),
+        ("chapter_number", meta.chapter_number),
+        ("chapter_name", meta.chapter_name),
+        ("article_number", meta.article_number),
+        ("article_name", meta.article_name),
+        ("updated_at", meta.updated_at),
+    )
+    header = "".join([f"[{name}] {value}\n" for name, value in fields if value])
+    return f"{header}\n{article_text}\n\n" if header else f"{article_text}\n\n"
+
+
+def load_done_hrefs(done_path: str) -> Set[str]:
+    if not os.path.exists(done_path):
+        return set()
+    with open(done_path, "r", encoding="utf-8") as f:
+        return {ln.strip() for ln in f if ln.strip()}
+
+
+def write_batch(f: TextIO, done: TextIO, batch: List[Tuple[str, str]]) -> None:
+    f.writelines(blob for _, blob in batch)
+    f.flush()
+    done.writelines(f"{href}\n" for href, _ in batch)
+    done.flush()
+
+
+def sync_and_close(*files: TextIO) -> None:
+    for fh in files:
+        try:
+            fh.flush()
+            os.fsync(fh.fileno())
+        finally:
+            fh.close()
+
+
+async def article_writer(queue: "asyncio.Queue[Optional[Tuple[str, str]]]", output_path: str, done_path: str) -> None:
+    # Single consumer: the file is opened once per code and appended to in queue order.
+    # Hrefs go to the .done sidecar only after their articles are flushed to the output file.
+    # Disk work runs in a worker thread so the event loop keeps serving fetches meanwhile.
+    f = await asyncio.to_thread(open, output_path, "a", encoding="utf-8", buffering=1 << 20)
+    done = await asyncio.to_thread(open, done_path, "a", encoding="utf-8")
+    try:
+        pending: List[Tuple[str, str]] = []
+        while (item := await queue.get()) is not None:
+            pending.append(item)
+            if len(pending) >= WRITE_BATCH_SIZE:
+                await asyncio.to_thread(write_batch, f, done, pending)
+                pending = []
+        await asyncio.to_thread(write_batch, f, done, pending)
+    finally:
+        await asyncio.to_thread(sync_and_close, f, done)
 
 
 async def process_code(
@@ -194,14 +342,20 @@ async def process_code(
     min_delay: float,
     max_delay: float,
     max_articles: Optional[int] = None,
+    concurrency: int = 8,
+    stealth: bool = False,
 ) -> None:
-    page = await browser_context.new_page()
-    await human_delay(min_delay, max_delay)
+    toc_page = await browser_context.new_page()
+    try:
+        if stealth:
+            await human_delay(min_delay, max_delay)
 
-    code_url = BASE_URL + code_href
-    await goto_with_retry(page, code_url)
+        code_url = BASE_URL + code_href
+        await goto_with_retry(toc_page, code_url)
 
-    items = await extract_toc_items(page, min_delay, max_delay)
+        items = await extract_toc_items(toc_page, min_delay, max_delay, stealth)
+    finally:
+        await toc_page.close()
 
     current_section_number = ""
     current_section_name = ""
@@ -209,56 +363,99 @@ async def process_code(
     current_chapter_name = ""
 
     code_slug = slug_from_href(code_href)
-    ensure_output_dir(output_dir)
     output_path = os.path.join(output_dir, f"{code_slug}.txt")
+    # Articles already written by an earlier (interrupted) run are skipped
+    done_path = output_path + ".done"
+    done_hrefs = load_done_hrefs(done_path)
 
-    written = 0
-
+    # Walk the TOC once to attach section/chapter context to every article link
+    jobs: List[Tuple[ArticleMeta, str]] = []
     for item in items:
         href: str = item.get("href", "")
         text: str = (item.get("text", "") or "").strip()
         if not text and not href:
-            await human_delay(min_delay, max_delay)
             continue
 
-        lower = text.lower()
-        if lower.startswith("раздел"):
-            sn, snm = parse_title_number_and_name(text, "Раздел")
-            current_section_number, current_section_name = sn, snm
-        elif lower.startswith("глава"):
-            cn, cnm = parse_title_number_and_name(text, "Глава")
-            current_chapter_number, current_chapter_name = cn, cnm
-        elif lower.startswith("статья") and href:
-            an, anm = parse_title_number_and_name(text or "", "Статья")
-            article_url = BASE_URL + href
+        heading = classify_toc_heading(text)
+        if heading is None:
+            continue
 
-            try:
-                await goto_with_retry(page, article_url)
-                article_text, updated_at = await extract_article_text_and_date(page, min_delay, max_delay)
-                meta = ArticleMeta(
-                    section_number=current_section_number or "",
-                    section_name=current_section_name or "",
-                    chapter_number=current_chapter_number or "",
-                    chapter_name=current_chapter_name or "",
-                    article_number=an or "",
-                    article_name=anm or (text or ""),
-                    updated_at=updated_at or "",
-                )
-                await write_article(output_path, meta, article_text)
-                written += 1
-                await goto_with_retry(page, code_url)
-            except PlaywrightError:
-                pass
+        kind, number, name = heading
+        if kind == "раздел":
+            current_section_number, current_section_name = number, name
+        elif kind == "глава":
+            current_chapter_number, current_chapter_name = number, name
+        elif kind == "статья" and href:
+            an, anm = number, name
+            meta = ArticleMeta(
+                section_number=current_section_number or "",
+                section_name=current_section_name or "",
+                chapter_number=current_chapter_number or "",
+                chapter_name=current_chapter_name or "",
+                article_number=an or "",
+                article_name=anm or (text or ""),
+                updated_at="",
+            )
+            if href not in done_hrefs:
+                jobs.append((meta, href))
 
-            if max_articles is not None and written >= max_articles:
+            if max_articles is not None and len(jobs) >= max_articles:
                 break
 
-        await human_delay(min_delay, max_delay)
+    sem = asyncio.BoundedSemaphore(max(1, concurrency))
+
+    async def render_article(article_url: str) -> Tuple[str, str]:
+        page = await browser_context.new_page()
+        try:
+            await goto_with_retry(page, article_url)
+            return await extract_article_text_and_date(page, min_delay, max_delay, stealth)
+        finally:
+            await page.close()
+
+    async def fetch_one(meta: ArticleMeta, href: str) -> Optional[Tuple[str, str]]:
+        article_url = BASE_URL + href
+        async with sem:
+            try:
+                html = await fetch_html_with_retry(browser_context, article_url)
+                if html is None:
+                    return None
+                parsed = parse_article_html(html)
+                if parsed is None:
+                    # Fall back to a rendered page when the static HTML lacks the article block
+                    parsed = await render_article(article_url)
+            except PlaywrightError:
+                return None
+            article_text, updated_at = parsed
+            if stealth:
+                await human_delay(min_delay, max_delay)
+        return href, format_article(replace(meta, updated_at=updated_at or ""), article_text)
+
+    queue: "asyncio.Queue[Optional[Tuple[str, str]]]" = asyncio.Queue()
+    writer_task = asyncio.create_task(article_writer(queue, output_path, done_path))
+    tasks = [asyncio.create_task(fetch_one(meta, href)) for meta, href in jobs]
+    try:
+        # Hand results to the writer in TOC order while later fetches are still in flight
+        for task in tasks:
+            result = await task
+            if result is not None:
+                await queue.put(result)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await queue.put(None)
+        await writer_task
 
-    await page.close()
 
+async def block_heavy_resources(route: Route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
 
-async def launch_context(headless: bool, min_delay: float, max_delay: float) -> BrowserContext:
+
+async def launch_context(headless: bool, min_delay: float, max_delay: float, stealth: bool = False) -> Tuple[Playwright, BrowserContext]:
     playwright = await async_playwright().start()
     browser: Browser = await playwright.chromium.launch(
         headless=headless,
@@ -267,27 +464,108 @@ async def launch_context(headless: bool, min_delay: float, max_delay: float) ->
             "--no-default-browser-check",
             "--disable-dev-shm-usage",
         ],
-        slow_mo=random.randint(int(min_delay * 300), int(max_delay * 500)),
+        slow_mo=RNG.randint(int(min_delay * 300), int(max_delay * 500)) if stealth else 0,
     )
 
     context = await browser.new_context(
         locale="ru-RU",
         user_agent=random_user_agent(),
-        viewport={"width": random.randint(1280, 1600), "height": random.randint(800, 1000)},
+        viewport={"width": RNG.randint(1280, 1600), "height": RNG.randint(800, 1000)},
     )
-    return context
+    await context.route("**/*", block_heavy_resources)
+    return playwright, context
+
+
+async def close_browser(playwright: Playwright, context: BrowserContext) -> None:
+    # Closing only the context would leave Chromium and the Playwright driver running
+    try:
+        await context.close()
+        if context.browser is not None:
+            await context.browser.close()
+    except Exception:
+        pass
+    finally:
+        await playwright.stop()
 
 
-async def run_async(output_dir: str, codes: str, headed: bool, max_articles: Optional[int], delay_min: float, delay_max: float) -> None:
+async def crawl_codes(
+    context: BrowserContext,
+    selected: List[Tuple[str, str]],
+    output_dir: str,
+    max_articles: Optional[int],
+    delay_min: float,
+    delay_max: float,
+    concurrency: int,
+    stealth: bool,
+) -> None:
+    for code_text, href in selected:
+        await process_code(
+            browser_context=context,
+            code_text=code_text,
+            code_href=href,
+            output_dir=output_dir,
+            min_delay=delay_min,
+            max_delay=delay_max,
+            max_articles=max_articles,
+            concurrency=concurrency,
+            stealth=stealth,
+        )
+        if stealth:
+            await human_delay(max(0.2, delay_min * 0.5), max(0.8, delay_max * 1.2))
+
+
+async def crawl_codes_in_new_context(
+    selected: List[Tuple[str, str]],
+    output_dir: str,
+    headed: bool,
+    max_articles: Optional[int],
+    delay_min: float,
+    delay_max: float,
+    concurrency: int,
+    stealth: bool,
+) -> None:
+    playwright, context = await launch_context(headless=not headed, min_delay=delay_min, max_delay=delay_max, stealth=stealth)
+    try:
+        await crawl_codes(context, selected, output_dir, max_articles, delay_min, delay_max, concurrency, stealth)
+    finally:
+        await close_browser(playwright, context)
+
+
+def run_codes_subset(
+    selected: List[Tuple[str, str]],
+    output_dir: str,
+    headed: bool,
+    max_articles: Optional[int],
+    delay_min: float,
+    delay_max: float,
+    concurrency: int,
+    stealth: bool,
+) -> None:
+    # Entry point for worker processes: each one drives its own Playwright instance
+    asyncio.run(crawl_codes_in_new_context(selected, output_dir, headed, max_articles, delay_min, delay_max, concurrency, stealth))
+
+
+async def run_async(
+    output_dir: str,
+    codes: str,
+    headed: bool,
+    max_articles: Optional[int],
+    delay_min: float,
+    delay_max: float,
+    concurrency: int = 8,
+    stealth: bool = False,
+    workers: int = 1,
+) -> None:
     ensure_output_dir(output_dir)
 
-    context = await launch_context(headless=not headed, min_delay=delay_min, max_delay=delay_max)
+    playwright, context = await launch_context(headless=not headed, min_delay=delay_min, max_delay=delay_max, stealth=stealth)
 
     try:
         home_page = await context.new_page()
-        await human_delay(delay_min, delay_max)
+        if stealth:
+            await human_delay(delay_min, delay_max)
 
-        all_codes = await extract_codes_from_home(home_page, delay_min, delay_max)
+        all_codes = await extract_codes_from_home(home_page, delay_min, delay_max, stealth)
         await home_page.close()
 
         code_slug_allowlist: Optional[set] = None
@@ -300,48 +578,33 @@ async def run_async(output_dir: str, codes: str, headed: bool, max_articles: Opt
             if code_slug_allowlist is None or slug in code_slug_allowlist:
                 selected.append((code_text, href))
 
-        for code_text, href in selected:
-            await process_code(
-                browser_context=context,
-                code_text=code_text,
-                code_href=href,
-                output_dir=output_dir,
-                min_delay=delay_min,
-                max_delay=delay_max,
-                max_articles=max_articles,
-            )
-            await human_delay(max(0.2, delay_min * 0.5), max(0.8, delay_max * 1.2))
+        if workers <= 1 or len(selected) <= 1:
+            await crawl_codes(context, selected, output_dir, max_articles, delay_min, delay_max, concurrency, stealth)
+            return
 
     finally:
-        try:
-            await context.close()
-        except Exception:
-            pass
+        # Also before forking the worker pool: the parent's browser would otherwise sit idle for the whole crawl
+        await close_browser(playwright, context)
+
+    # Codes are independent (one output file each), so they can be split across processes
+    worker_count = min(workers, len(selected))
+    subsets = [selected[i::worker_count] for i in range(worker_count)]
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        await asyncio.gather(*(
+            loop.run_in_executor(
+                executor, run_codes_subset, subset, output_dir, headed, max_articles, delay_min, delay_max, concurrency, stealth
+            )
+            for subset in subsets
+        ))
 
 
 def clean_article_text(raw: str) -> str:
-    lines = [ln.strip() for ln in raw.splitlines()]
-    cleaned: List[str] = []
-    nav_re = re.compile(r"^(<|>|Статья\s+\d+[\.\:\s]|Статья\s+[IVXLCDM]+[\.\:\s])")
-    for ln in lines:
-        if not ln:
-            cleaned.append(ln)
-            continue
-        if nav_re.match(ln):
-            continue
-        cleaned.append(ln)
+    text = LINE_BREAK_RE.sub("\n", raw).strip()
+    text = LINE_EDGE_WHITESPACE_RE.sub("\n", text)
+    text = NAV_LINE_RE.sub("", text)
     # Collapse excessive blank lines
-    out: List[str] = []
-    blank = False
-    for ln in cleaned:
-        if ln == "":
-            if not blank:
-                out.append("")
-            blank = True
-        else:
-            out.append(ln)
-            blank = False
-    return "\n".join(out).strip()
+    return BLANK_LINES_RE.sub("\n\n", text).strip()
 
 
 @click.command()
@@ -351,8 +614,11 @@ def clean_article_text(raw: str) -> str:
 @click.option("--max-articles", default=None, type=int, help="Limit number of articles per code (testing)")
 @click.option("--delay-min", default=0.3, type=float, show_default=True, help="Minimum human delay in seconds")
 @click.option("--delay-max", default=1.0, type=float, show_default=True, help="Maximum human delay in seconds")
-def main(output_dir: str, codes: str, headed: bool, max_articles: Optional[int], delay_min: float, delay_max: float) -> None:
-    asyncio.run(run_async(output_dir, codes, headed, max_articles, delay_min, delay_max))
+@click.option("--concurrency", default=8, type=int, show_default=True, help="Maximum number of articles fetched in parallel")
+@click.option("--stealth/--no-stealth", default=False, show_default=True, help="Humanize browsing (mouse moves, scrolling, delays, slow_mo)")
+@click.option("--workers", default=1, type=int, show_default=True, help="Number of processes (each with its own browser) to split codes across")
+def main(output_dir: str, codes: str, headed: bool, max_articles: Optional[int], delay_min: float, delay_max: float, concurrency: int, stealth: bool, workers: int) -> None:
+    asyncio.run(run_async(output_dir, codes, headed, max_articles, delay_min, delay_max, concurrency, stealth, workers))
 
 
 if __name__ == "__main__":
@@ -2,12 +2,14 @@ import asyncio
 import os
 import re
 import random
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict, Set
+from typing import Deque, List, Optional, Tuple, Dict, Set, TextIO
 
 import click
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Error as PlaywrightError, Response
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route, Error as PlaywrightError, Response
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 
 BASE_URL = "https://legalacts.ru"
@@ -17,6 +19,39 @@ LAW_ITEM_SELECTOR = f"{CENTER_BLOCK_SELECTOR} div.pb-4 a[href^='/doc/']"
 PAGINATION_LINKS_SELECTOR = "li.page-item a.page-link"
 LAW_HEADER_SELECTOR = "h1.main-center-block-title.pb-4"
 LAW_TEXT_SELECTORS = "p.pCenter, p.pRight, p.pBoth"
+# Formatted entries buffered by the writer before each writelines() call
+WRITE_BATCH_SIZE = 32
+# Index pages loaded ahead of the one whose laws are being scheduled
+INDEX_PAGES_AHEAD = 2
+
+INLINE_WHITESPACE_RE = re.compile(r"\s+")
+DATE_RE = re.compile(r"\b(\d{2}\.\d{2}\.\d{4})\b")
+# law_number (e.g., 297-ФЗ), allow dotted/hyphenated before -ФЗ
+LAW_NUMBER_RE = re.compile(r"(?:N|№)\s*([0-9]+(?:[.\-][0-9]+)*-ФЗ)")
+LAW_NUMBER_FALLBACK_RE = re.compile(r"([0-9]+(?:[.\-][0-9]+)*-ФЗ)")
+LAW_NAME_RE = re.compile(r"“([^”]+)”")
+LAW_NAME_FALLBACK_RE = re.compile(r'"([^\"]+)"')
+PAGE_PARAM_RE = re.compile(r"[?&]page=(\d+)")
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+PARAGRAPH_TAGS = {"p": 2, "h1": 2, "h2": 2, "h3": 2, "h4": 2, "h5": 2, "h6": 2}
+BLOCK_TAGS = {
+    "div", "section", "article", "header", "footer", "blockquote", "pre",
+    "ul", "ol", "li", "dl", "dt", "dd", "table", "tr", "caption",
+}
+
+# Only the HTML carries the text we extract; everything else is dead weight on each page load
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = ("mc.yandex.ru", "google-analytics.com", "googletagmanager.com", "top-fwz1.mail.ru")
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+)
+# One generator per process, shared by delays, humanization and browser fingerprint choices.
+# Forked workers would otherwise inherit the parent's state and draw identical sequences.
+RNG = random.Random()
+os.register_at_fork(after_in_child=RNG.seed)
 
 
 @dataclass
@@ -27,33 +62,28 @@ class LawMeta:
 
 
 def random_user_agent() -> str:
-    user_agents = [
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-    ]
-    return random.choice(user_agents)
+    return RNG.choice(USER_AGENTS)
 
 
 async def human_delay(min_seconds: float, max_seconds: float) -> None:
-    await asyncio.sleep(random.uniform(min_seconds, max_seconds))
+    await asyncio.sleep(RNG.uniform(min_seconds, max_seconds))
 
 
 async def humanize_page(page: Page, min_delay: float, max_delay: float) -> None:
-    width = random.randint(1200, 1600)
-    height = random.randint(800, 1000)
+    width = RNG.randint(1200, 1600)
+    height = RNG.randint(800, 1000)
     try:
         await page.set_viewport_size({"width": width, "height": height})
     except Exception:
         pass
     try:
-        for _ in range(random.randint(1, 3)):
-            x = random.randint(50, width - 50)
-            y = random.randint(100, height - 100)
-            await page.mouse.move(x, y, steps=random.randint(8, 20))
+        for _ in range(RNG.randint(1, 3)):
+            x = RNG.randint(50, width - 50)
+            y = RNG.randint(100, height - 100)
+            await page.mouse.move(x, y, steps=RNG.randint(8, 20))
             await human_delay(min_delay, max_delay)
-        for _ in range(random.randint(1, 3)):
-            delta = random.randint(150, 500)
+        for _ in range(RNG.randint(1, 3)):
+            delta = RNG.randint(150, 500)
             await page.mouse.wheel(0, delta)
             await human_delay(min_delay, max_delay)
     except Exception:
@@ -68,19 +98,39 @@ async def humanize_page(page: Page, min_delay: float, max_delay: float) -> None:
 )
 async def goto_with_retry(page: Page, url: str) -> Optional[Response]:
     resp: Optional[Response] = await page.goto(url, timeout=45000, wait_until="domcontentloaded")
-    try:
-        status = resp.status if resp is not None else 0
-        if status != 200:
-            await page.reload(wait_until="domcontentloaded")
-    except Exception:
-        pass
+    # Redirects are already followed by goto; only server errors are worth another attempt
+    if resp is not None and resp.status >= 500:
+        raise PlaywrightError(f"status {resp.status} for {url}")
     return resp
 
 
+@retry(
+    reraise=True,
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=6),
+    retry=retry_if_exception_type(PlaywrightError),
+)
+async def fetch_html_with_retry(context: BrowserContext, url: str) -> Optional[str]:
+    # Plain HTTP through the context (shares cookies and user agent), no rendering.
+    # Throttling and server errors are retried with backoff; None means the page is not there.
+    resp = await context.request.get(url, timeout=45000)
+    if resp.status == 429 or resp.status >= 500:
+        raise PlaywrightError(f"status {resp.status} for {url}")
+    if not resp.ok:
+        return None
+    return await resp.text()
+
+
 def ensure_output_dir(path: str) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
 
+async def wait_for_selector_if_missing(page: Page, selector: str, timeout: int = 30000) -> None:
+    # After a domcontentloaded goto the node is usually there already; only poll when it is not
+    if await page.query_selector(selector) is None:
+        await page.wait_for_selector(selector, timeout=timeout)
+
+
 async def get_text_or_empty(page: Page, selector: str) -> str:
     try:
         locator = page.locator(selector)
@@ -91,22 +141,53 @@ async def get_text_or_empty(page: Page, selector: str) -> str:
         return ""
 
 
+def html_inner_text(node: LexborNode) -> str:
+    # Approximates Element.innerText: inline whitespace collapses, block elements break lines
+    chunks: List[str] = []
+    pending_breaks = 0
+
+    def walk(parent: LexborNode) -> None:
+        nonlocal pending_breaks
+        for child in parent.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                text = INLINE_WHITESPACE_RE.sub(" ", child.text_content or "")
+                if pending_breaks and text.strip():
+                    if chunks:
+                        chunks.append("\n" * pending_breaks)
+                    pending_breaks = 0
+                chunks.append(text)
+            elif tag == "br":
+                chunks.append("\n")
+            elif tag in SKIPPED_TAGS:
+                continue
+            else:
+                breaks = PARAGRAPH_TAGS.get(tag, 1 if tag in BLOCK_TAGS else 0)
+                pending_breaks = max(pending_breaks, breaks)
+                walk(child)
+                pending_breaks = max(pending_breaks, breaks)
+
+    walk(node)
+    text = "".join(chunks)
+    return "\n".join(ln.strip() for ln in text.split("\n")).strip()
+
+
 def parse_law_header(header_text: str) -> LawMeta:
     text = "\n".join([ln.strip() for ln in header_text.splitlines() if ln.strip()])
     # updated_at (date)
-    m_date = re.search(r"\b(\d{2}\.\d{2}\.\d{4})\b", text)
+    m_date = DATE_RE.search(text)
     updated_at = m_date.group(1) if m_date else ""
 
-    # law_number (e.g., 297-ФЗ), allow dotted/hyphenated before -ФЗ
-    m_num = re.search(r"(?:N|№)\s*([0-9]+(?:[.\-][0-9]+)*-ФЗ)", text)
+    # law_number
+    m_num = LAW_NUMBER_RE.search(text)
     if not m_num:
-        m_num = re.search(r"([0-9]+(?:[.\-][0-9]+)*-ФЗ)", text)
+        m_num = LAW_NUMBER_FALLBACK_RE.search(text)
     law_number = m_num.group(1) if m_num else ""
 
     # law_name: try quoted part first, else take last non-empty line without quotes
-    m_name = re.search(r"“([^”]+)”", text)
+    m_name = LAW_NAME_RE.search(text)
     if not m_name:
-        m_name = re.search(r'"([^\"]+)"', text)
+        m_name = LAW_NAME_FALLBACK_RE.search(text)
     if m_name:
         law_name = m_name.group(1).strip()
     else:
@@ -117,66 +198,104 @@ def parse_law_header(header_text: str) -> LawMeta:
     return LawMeta(law_number=law_number, law_name=law_name, updated_at=updated_at)
 
 
-async def extract_law_text(page: Page, min_delay: float, max_delay: float) -> str:
-    await page.wait_for_selector(CENTER_BLOCK_SELECTOR, timeout=30000)
-    await humanize_page(page, min_delay, max_delay)
+def parse_law_paragraphs(tree: LexborHTMLParser) -> str:
+    paragraphs = [p.text().strip() for p in tree.css(f"{CENTER_BLOCK_SELECTOR} {LAW_TEXT_SELECTORS}")]
+    return "\n".join(p for p in paragraphs if p).strip()
 
-    paragraphs = await page.eval_on_selector_all(
-        f"{CENTER_BLOCK_SELECTOR} {LAW_TEXT_SELECTORS}",
-        "els => els.map(p => p.textContent?.trim() || '').filter(Boolean)",
-    )
-    return "\n".join(paragraphs).strip()
 
+def parse_law_html(html: str) -> Optional[Tuple[LawMeta, str]]:
+    tree = LexborHTMLParser(html)
+    if tree.css_first(CENTER_BLOCK_SELECTOR) is None:
+        return None
 
-async def write_law(output_file: str, meta: LawMeta, law_text: str) -> None:
-    ensure_output_dir(output_file)
-    with open(output_file, "a", encoding="utf-8") as f:
-        if meta.law_number:
-            f.write(f"[law_number] {meta.law_number}\n")
-        if meta.law_name:
-            f.write(f"[law_name] {meta.law_name}\n")
-        if meta.updated_at:
-            f.write(f"[updated_at] {meta.updated_at}\n")
-        if meta.law_number or meta.law_name or meta.updated_at:
-            f.write("\n")
-        f.write(law_text)
-        f.write("\n\n")
-
-
-async def get_max_pages(page: Page, min_delay: float, max_delay: float) -> int:
-    await page.wait_for_selector(CENTER_BLOCK_SELECTOR, timeout=30000)
-    await humanize_page(page, min_delay, max_delay)
-
-    hrefs = await page.eval_on_selector_all(
-        PAGINATION_LINKS_SELECTOR,
-        "els => els.map(a => a.getAttribute('href') || '')",
+    header_node = tree.css_first(LAW_HEADER_SELECTOR)
+    meta = parse_law_header(html_inner_text(header_node) if header_node is not None else "")
+    return meta, parse_law_paragraphs(tree)
+
+
+async def extract_law_text(page: Page, min_delay: float, max_delay: float, stealth: bool = False) -> str:
+    await wait_for_selector_if_missing(page, CENTER_BLOCK_SELECTOR)
+    if stealth:
+        await humanize_page(page, min_delay, max_delay)
+
+    return parse_law_paragraphs(LexborHTMLParser(await page.content()))
+
+
+def format_law(meta: LawMeta, law_text: str) -> str:
+    fields = (
+        ("law_number", meta.law_number),
+        ("law_name", meta.law_name),
+        ("updated_at", meta.updated_at),
     )
+    header = "".join([f"[{name}] {value}\n" for name, value in fields if value])
+    return f"{header}\n{law_text}\n\n" if header else f"{law_text}\n\n"
+
+
+def write_batch(f: TextIO, batch: List[str]) -> None:
+    f.writelines(batch)
+    f.flush()
+
+
+def sync_and_close(f: TextIO) -> None:
+    try:
+        f.flush()
+        os.fsync(f.fileno())
+    finally:
+        f.close()
+
+
+async def law_writer(queue: "asyncio.Queue[Optional[str]]", output_file: str) -> None:
+    # Single consumer: the output file is opened once per run and appended to in queue order.
+    # Disk work runs in a worker thread so the event loop keeps serving fetches meanwhile.
+    f = await asyncio.to_thread(open, output_file, "a", encoding="utf-8", buffering=1 << 20)
+    try:
+        pending: List[str] = []
+        while (blob := await queue.get()) is not None:
+            pending.append(blob)
+            if len(pending) >= WRITE_BATCH_SIZE:
+                await asyncio.to_thread(write_batch, f, pending)
+                pending = []
+        await asyncio.to_thread(write_batch, f, pending)
+    finally:
+        await asyncio.to_thread(sync_and_close, f)
+
+
+def parse_max_page(tree: LexborHTMLParser) -> int:
     max_page = 1
-    for href in hrefs:
-        m = re.search(r"[?&]page=(\d+)", href)
+    for a in tree.css(PAGINATION_LINKS_SELECTOR):
+        m = PAGE_PARAM_RE.search(a.attributes.get("href") or "")
         if m:
             max_page = max(max_page, int(m.group(1)))
     return max_page
 
 
-async def collect_law_links_on_page(page: Page, min_delay: float, max_delay: float) -> List[Tuple[str, str]]:
-    await page.wait_for_selector(CENTER_BLOCK_SELECTOR, timeout=30000)
-    await humanize_page(page, min_delay, max_delay)
-
-    links = await page.eval_on_selector_all(
-        LAW_ITEM_SELECTOR,
-        "els => els.map(a => ({href: a.getAttribute('href') || '', text: a.textContent?.trim() || ''}))",
-    )
+def parse_law_links(tree: LexborHTMLParser) -> List[Tuple[str, str]]:
     result: List[Tuple[str, str]] = []
-    for item in links:
-        href = item.get("href") or ""
-        text = item.get("text") or ""
+    for a in tree.css(LAW_ITEM_SELECTOR):
+        href = a.attributes.get("href") or ""
+        text = a.text().strip()
         if href.startswith("/doc/") and text:
             result.append((href, text))
     return result
 
 
-async def launch_context(headless: bool, min_delay: float, max_delay: float) -> BrowserContext:
+async def read_index_page(page: Page, min_delay: float, max_delay: float, stealth: bool = False) -> LexborHTMLParser:
+    await wait_for_selector_if_missing(page, CENTER_BLOCK_SELECTOR)
+    if stealth:
+        await humanize_page(page, min_delay, max_delay)
+
+    return LexborHTMLParser(await page.content())
+
+
+async def block_heavy_resources(route: Route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def launch_context(headless: bool, min_delay: float, max_delay: float, stealth: bool = False) -> BrowserContext:
     playwright = await async_playwright().start()
     browser: Browser = await playwright.chromium.launch(
         headless=headless,
@@ -185,14 +304,15 @@ async def launch_context(headless: bool, min_delay: float, max_delay: float) ->
             "--no-default-browser-check",
             "--disable-dev-shm-usage",
         ],
-        slow_mo=random.randint(int(min_delay * 300), int(max_delay * 500)),
+        slow_mo=RNG.randint(int(min_delay * 300), int(max_delay * 500)) if stealth else 0,
     )
 
     context = await browser.new_context(
         locale="ru-RU",
         user_agent=random_user_agent(),
-        viewport={"width": random.randint(1280, 1600), "height": random.randint(800, 1000)},
+        viewport={"width": RNG.randint(1280, 1600), "height": RNG.randint(800, 1000)},
     )
+    await context.route("**/*", block_heavy_resources)
     return context
 
 
@@ -204,63 +324,142 @@ async def launch_context(headless: bool, min_delay: float, max_delay: float) ->
 @click.option("--start-page", default=1, type=int, show_default=True, help="Start page number to resume from")
 @click.option("--delay-min", default=0.3, type=float, show_default=True, help="Minimum human delay in seconds")
 @click.option("--delay-max", default=1.0, type=float, show_default=True, help="Maximum human delay in seconds")
-def main(output_file: str, headed: bool, max_pages: Optional[int], max_laws: Optional[int], start_page: int, delay_min: float, delay_max: float) -> None:
-    asyncio.run(run_async(output_file, headed, max_pages, max_laws, start_page, delay_min, delay_max))
-
+@click.option("--concurrency", default=8, type=int, show_default=True, help="Maximum number of laws fetched in parallel")
+@click.option("--stealth/--no-stealth", default=False, show_default=True, help="Humanize browsing (mouse moves, scrolling, delays, slow_mo)")
+def main(output_file: str, headed: bool, max_pages: Optional[int], max_laws: Optional[int], start_page: int, delay_min: float, delay_max: float, concurrency: int, stealth: bool) -> None:
+    asyncio.run(run_async(output_file, headed, max_pages, max_laws, start_page, delay_min, delay_max, concurrency, stealth))
+
+
+async def run_async(
+    output_file: str,
+    headed: bool,
+    max_pages: Optional[int],
+    max_laws: Optional[int],
+    start_page: int,
+    delay_min: float,
+    delay_max: float,
+    concurrency: int = 8,
+    stealth: bool = False,
+) -> None:
+    ensure_output_dir(output_file)
 
-async def run_async(output_file: str, headed: bool, max_pages: Optional[int], max_laws: Optional[int], start_page: int, delay_min: float, delay_max: float) -> None:
-    context = await launch_context(headless=not headed, min_delay=delay_min, max_delay=delay_max)
-    page = await context.new_page()
-    try:
-        index_url = BASE_URL + LAWS_INDEX_PATH
+    context = await launch_context(headless=not headed, min_delay=delay_min, max_delay=delay_max, stealth=stealth)
+    sem = asyncio.BoundedSemaphore(max(1, concurrency))
 
-        fetched = 0
-        pnum = start_page if start_page and start_page > 0 else 1
-        while True:
-            list_url = index_url if pnum == 1 else f"{index_url}?page={pnum}"
-            print(f"[laws] processing page {pnum}: {list_url}")
+    async def render_law(law_url: str) -> Tuple[LawMeta, str]:
+        law_page = await context.new_page()
+        try:
+            await goto_with_retry(law_page, law_url)
+            header_text = await get_text_or_empty(law_page, LAW_HEADER_SELECTOR)
+            meta = parse_law_header(header_text)
+            law_text = await extract_law_text(law_page, delay_min, delay_max, stealth)
+            return meta, law_text
+        finally:
+            await law_page.close()
+
+    async def fetch_one(law_url: str) -> Optional[str]:
+        async with sem:
             try:
-                await goto_with_retry(page, list_url)
+                html = await fetch_html_with_retry(context, law_url)
+                if html is None:
+                    return None
+                parsed = parse_law_html(html)
+                if parsed is None:
+                    # Fall back to a rendered page when the static HTML lacks the law body
+                    parsed = await render_law(law_url)
             except PlaywrightError:
-                break
-
-            links = await collect_law_links_on_page(page, delay_min, delay_max)
-            if not links:
-                break
-
-            for href, _ in links:
-                law_url = BASE_URL + href
-                try:
-                    await goto_with_retry(page, law_url)
-                    header_text = await get_text_or_empty(page, LAW_HEADER_SELECTOR)
-                    meta = parse_law_header(header_text)
-                    law_text = await extract_law_text(page, delay_min, delay_max)
-                    await write_law(output_file, meta, law_text)
-                    fetched += 1
-                except PlaywrightError:
-                    pass
-                finally:
-                    # Return to list page after each law
-                    try:
-                        await goto_with_retry(page, list_url)
-                    except PlaywrightError:
-                        pass
-
-                if max_laws is not None and fetched >= max_laws:
-                    break
-
-            if max_laws is not None and fetched >= max_laws:
-                break
-
-            pnum += 1
-            if max_pages is not None and pnum > max_pages:
-                break
-
-            await human_delay(delay_min, delay_max)
+                return None
+            meta, law_text = parsed
+            if stealth:
+                await human_delay(delay_min, delay_max)
+        return format_law(meta, law_text)
+
+    index_url = BASE_URL + LAWS_INDEX_PATH
+
+    def page_url(pnum: int) -> str:
+        return index_url if pnum == 1 else f"{index_url}?page={pnum}"
+
+    async def collect_page(pnum: int) -> Tuple[List[Tuple[str, str]], int]:
+        list_url = page_url(pnum)
+        print(f"[laws] processing page {pnum}: {list_url}")
+        list_page = await context.new_page()
+        try:
+            await goto_with_retry(list_page, list_url)
+            index_tree = await read_index_page(list_page, delay_min, delay_max, stealth)
+            return parse_law_links(index_tree), parse_max_page(index_tree)
+        except PlaywrightError:
+            return [], pnum
+        finally:
+            await list_page.close()
+
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    writer_task = asyncio.create_task(law_writer(queue, output_file))
+    # Only pending tasks are kept for cancellation; a finished task would pin its law body in memory
+    page_tasks: Set["asyncio.Task[Tuple[List[Tuple[str, str]], int]]"] = set()
+    law_tasks: Set["asyncio.Task[Optional[str]]"] = set()
+    scheduler_task: Optional["asyncio.Task[None]"] = None
+    try:
+        first_page = start_page if start_page and start_page > 0 else 1
+
+        # Schedule law fetches page by page. Index pages are opened lazily, a few ahead of the page
+        # whose laws are being scheduled, outside the law semaphore so they never queue behind law
+        # fetches, and none are opened once max_laws links have been scheduled. The last page grows
+        # with every index page read, since pagination may show only a window of pages around the
+        # current one; as before, the crawl also ends at the first index page without links.
+        ordered: "asyncio.Queue[Optional[asyncio.Task[Optional[str]]]]" = asyncio.Queue()
+        # Laws scheduled but not yet written: enough to keep every fetch slot busy without turning a
+        # whole index page into tasks long before the law semaphore admits them
+        window = asyncio.Semaphore(2 * max(1, concurrency))
+
+        async def schedule_laws() -> None:
+            try:
+                scheduled = 0
+                links, last_page = await collect_page(first_page)
+                next_page = first_page + 1
+                upcoming: Deque["asyncio.Task[Tuple[List[Tuple[str, str]], int]]"] = deque()
+                while links:
+                    if max_laws is not None:
+                        links = links[: max(0, max_laws - scheduled)]
+                    scheduled += len(links)
+                    for href, _ in links:
+                        await window.acquire()
+                        task = asyncio.create_task(fetch_one(BASE_URL + href))
+                        law_tasks.add(task)
+                        task.add_done_callback(law_tasks.discard)
+                        ordered.put_nowait(task)
+                    if max_laws is not None and scheduled >= max_laws:
+                        break
+                    while len(upcoming) < INDEX_PAGES_AHEAD and next_page <= last_page and (max_pages is None or next_page <= max_pages):
+                        page_task = asyncio.create_task(collect_page(next_page))
+                        page_tasks.add(page_task)
+                        page_task.add_done_callback(page_tasks.discard)
+                        upcoming.append(page_task)
+                        next_page += 1
+                    if not upcoming:
+                        break
+                    links, page_last = await upcoming.popleft()
+                    last_page = max(last_page, page_last)
+            finally:
+                ordered.put_nowait(None)
+
+        scheduler_task = asyncio.create_task(schedule_laws())
+        # Hand results to the writer in index order while later fetches are still in flight
+        while (task := await ordered.get()) is not None:
+            blob = await task
+            if blob is not None:
+                await queue.put(blob)
+            window.release()
+        await scheduler_task
 
     finally:
+        background = [*page_tasks, *law_tasks, *([scheduler_task] if scheduler_task is not None else [])]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await queue.put(None)
+        await writer_task
         try:
-            await page.context.close()
+            await context.close()
         except Exception:
             pass
 
@@ -1,17 +1,68 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import heapq
+import itertools
+import logging
+import mmap
 import os
+import queue
 import re
+import sys
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Generator, Iterable, List, Tuple
-
-from langchain_qdrant import QdrantVectorStore, FastEmbedSparse, RetrievalMode
-from langchain_huggingface import HuggingFaceEmbeddings
-from qdrant_client import QdrantClient
-
-
-HEADER_LINE_RE = re.compile(r"^\[(?P<key>[a-z_]+)\]\s*(?P<value>.*)$", re.IGNORECASE)
+from typing import Dict, Generator, Iterable, Iterator, List, Tuple, TypeVar
+
+import torch
+import torch.nn.functional as F
+from langchain_qdrant import FastEmbedSparse, SparseVector
+from qdrant_client import QdrantClient, models
+from transformers import AutoTokenizer, T5EncoderModel
+
+
+T = TypeVar("T")
+logger = logging.getLogger(__name__)
+
+HEADER_LINE_RE = re.compile(rb"^\[(?P<key>[a-z_]+)\][^\S\n]*(?P<value>.*)$", re.IGNORECASE | re.MULTILINE)
+# A run of consecutive header lines; the "\n" prefix lets the regex engine skip body text with a fast literal scan
+HEADER_BLOCK = rb"(?:\[[a-z_]+\].*(?:\n|\Z))+"
+FIRST_HEADER_BLOCK_RE = re.compile(rb"(" + HEADER_BLOCK + rb")", re.IGNORECASE)
+NEXT_HEADER_BLOCK_RE = re.compile(rb"\n(" + HEADER_BLOCK + rb")", re.IGNORECASE)
+BLANK_LINE_RE = re.compile(rb"^(?:[ \t\r\f\v]|\xc2\xa0)*(?:\n|\Z)", re.MULTILINE)
+ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+# Payload keys and vector names match what QdrantVectorStore(HYBRID) used to write
+CONTENT_PAYLOAD_KEY = "page_content"
+METADATA_PAYLOAD_KEY = "metadata"
+DENSE_VECTOR_NAME = "dense"
+SPARSE_VECTOR_NAME = "sparse"
+# Batches buffered between pipeline stages
+PIPELINE_QUEUE_SIZE = 2
+DENSE_MODEL_NAME = "ai-forever/FRIDA"
+DENSE_MAX_LENGTH = 512
+# Padded sequence lengths used when the encoder is compiled
+PADDING_BUCKETS = (64, 128, 256, DENSE_MAX_LENGTH)
+# Texts per FRIDA forward pass
+DENSE_BATCH_SIZE = 64
+DTYPES = {"float32": torch.float32, "bfloat16": torch.bfloat16, "float16": torch.float16}
+GRPC_MAX_MESSAGE_LENGTH = 128 * 1024 * 1024
+# Qdrant defaults, restored after a bulk upload
+HNSW_M = 16
+INDEXING_THRESHOLD = 20000
+INDEX_POLL_INTERVAL = 1.0
+INDEX_BUILD_TIMEOUT = 3600.0
+DEFAULT_SEGMENTS = 2
+# Distinct article bodies whose vectors are remembered for repeats. Every distinct text takes an
+# entry: 4 bytes per dense dimension (6 KB for FRIDA) plus 8 bytes per BM25 term, ~10 KB typical
+EMBEDDING_CACHE_SIZE = 20_000
+# Seconds between progress lines
+PROGRESS_INTERVAL = 1.0
 
 
 def iterate_articles(file_path: str, limit: int | None = None) -> Generator[Tuple[Dict[str, str], str], None, None]:
@@ -24,60 +75,97 @@ def iterate_articles(file_path: str, limit: int | None = None) -> Generator[Tupl
       <blank line>\n
       <article text (can span multiple lines)>\n
       <next header or EOF>
+
+    The file is memory-mapped and header sections are located by regex over the raw bytes;
+    only header values and article bodies are decoded.
     """
+    if os.path.getsize(file_path) == 0:
+        return
+
     articles_yielded = 0
     metadata: Dict[str, str] = {}
-    body_lines: List[str] = []
-    in_header = False
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.rstrip("\n")
-
-            header_match = HEADER_LINE_RE.match(line)
-            if header_match:
-                # Starting a new header possibly means the previous article is complete
-                if metadata and body_lines:
-                    text = "\n".join(body_lines).strip()
-                    if text:
-                        yield metadata, text
-                        articles_yielded += 1
-                        if limit is not None and articles_yielded >= limit:
-                            return
-                    metadata = {}
-                    body_lines = []
-
-                in_header = True
-                key = header_match.group("key").strip()
-                value = header_match.group("value").strip()
-                metadata[key] = value
-                continue
 
-            # Non-header line
-            if in_header and line.strip() == "":
-                # End of header section; body begins afterward
-                in_header = False
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        found = FIRST_HEADER_BLOCK_RE.match(mm) or NEXT_HEADER_BLOCK_RE.search(mm)
+        while found is not None:
+            block_start, body_start = found.span(1)
+            for key, value in HEADER_LINE_RE.findall(view[block_start:body_start]):
+                metadata[key.decode("ascii")] = value.decode("utf-8").strip()
+
+            # A block ends right after a newline (or at EOF), so the next search starts on that newline
+            found = NEXT_HEADER_BLOCK_RE.search(mm, body_start - 1) if body_start < len(mm) else None
+            body_end = found.start(1) if found is not None else len(mm)
+
+            # The first blank line after the headers closes the header section and is not part of the body.
+            # It normally comes right after the headers; anything else means cutting it out of the middle.
+            gap = None
+            if mm[body_start : body_start + 1] == b"\n":
+                # Fast path for the separator the parsers write: skip the regex call
+                body_start += 1
+            elif (separator := BLANK_LINE_RE.search(mm, body_start, body_end)) is not None and separator.start() < body_end:
+                if separator.start() == body_start:
+                    body_start = separator.end()
+                else:
+                    gap = separator.span()
+
+            # Headers followed directly by more headers belong to the same article
+            if body_start < body_end:
+                if gap is None:
+                    start, end = strip_span(mm, body_start, body_end)
+                    text = str(view[start:end], "utf-8").strip()
+                else:
+                    text = (view[body_start : gap[0]].tobytes() + view[gap[1] : body_end]).decode("utf-8").strip()
+                if "\r" in text:
+                    text = text.replace("\r\n", "\n").replace("\r", "\n")
+                if text:
+                    yield metadata, text
+                    articles_yielded += 1
+                    if limit is not None and articles_yielded >= limit:
+                        return
+                metadata = {}
+
+
+def strip_span(buf: mmap.mmap, start: int, end: int) -> Tuple[int, int]:
+    # Trim ASCII whitespace by moving the offsets, so only the article itself gets decoded
+    while start < end and buf[start] in ASCII_WHITESPACE:
+        start += 1
+    while end > start and buf[end - 1] in ASCII_WHITESPACE:
+        end -= 1
+    return start, end
+
+
+def interleave_articles(
+    file_paths: List[str], limit: int | None = None
+) -> Generator[Tuple[str, int, Dict[str, str], str], None, None]:
+    """Yield (source_file, position, metadata, text) round-robin across files.
+
+    The file that has yielded the fewest articles goes next, so every upload batch mixes all
+    inputs until the shorter ones run out. position is the 1-based article index within its file.
+    """
+    readers = [iterate_articles(path) for path in file_paths]
+    # (articles yielded so far, file order) -> round-robin with a stable tie break
+    heap = [(0, order) for order in range(len(file_paths))]
+    sources = [sys.intern(os.path.basename(path)) for path in file_paths]
+    articles_yielded = 0
+    try:
+        while heap and (limit is None or articles_yielded < limit):
+            position, order = heapq.heappop(heap)
+            article = next(readers[order], None)
+            if article is None:
                 continue
+            yield sources[order], position + 1, article[0], article[1]
+            articles_yielded += 1
+            heapq.heappush(heap, (position + 1, order))
+    finally:
+        for reader in readers:
+            reader.close()
 
-            # Body line
-            body_lines.append(line)
-
-    # Flush last article at EOF
-    if metadata and body_lines:
-        text = "\n".join(body_lines).strip()
-        if text:
-            yield metadata, text
 
-
-def batch_iterable(iterable: Iterable[Tuple[Dict[str, str], str]], batch_size: int) -> Generator[List[Tuple[Dict[str, str], str]], None, None]:
-    batch: List[Tuple[Dict[str, str], str]] = []
-    for item in iterable:
-        batch.append(item)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+def chunks(iterable: Iterable[T], size: int) -> Generator[Iterator[T], None, None]:
+    # Lazy chunks over one shared iterator: each must be consumed before asking for the next
+    iterator = iter(iterable)
+    for first in iterator:
+        yield itertools.chain((first,), itertools.islice(iterator, size - 1))
 
 
 def resolve_input_file_path(user_path: str) -> str:
@@ -91,122 +179,497 @@ def resolve_input_file_path(user_path: str) -> str:
     raise FileNotFoundError(f"Input file not found: {user_path}")
 
 
-def ensure_collection(client: QdrantClient, collection_name: str, append: bool) -> None:
+def ensure_collection(
+    client: QdrantClient,
+    collection_name: str,
+    append: bool,
+    dense_size: int,
+    bulk_mode: bool,
+    quantize: bool,
+    segments: int | None,
+    optimization_threads: int | None,
+) -> bool:
+    """Create the collection unless appending to an existing one; return True if it was created."""
     exists = client.collection_exists(collection_name=collection_name)
     if exists and not append:
         client.delete_collection(collection_name=collection_name)
+        exists = False
+    if exists:
+        return False
+    # Same layout QdrantVectorStore creates in HYBRID mode, so the collection stays queryable through langchain.
+    # In bulk mode the HNSW graph is not built while points stream in; restore_indexing re-enables it once the upload ends.
+    # With quantization, searches run on int8 copies kept in RAM and the float32 originals stay on disk for rescoring.
+    # Fewer, larger segments favour throughput; capping optimizer threads leaves CPU for incoming writes.
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config={
+            DENSE_VECTOR_NAME: models.VectorParams(size=dense_size, distance=models.Distance.COSINE, on_disk=quantize)
+        },
+        sparse_vectors_config={SPARSE_VECTOR_NAME: models.SparseVectorParams()},
+        hnsw_config=models.HnswConfigDiff(m=0) if bulk_mode else None,
+        optimizers_config=models.OptimizersConfigDiff(
+            indexing_threshold=0 if bulk_mode else None,
+            default_segment_number=segments,
+            max_optimization_threads=optimization_threads,
+        ),
+        quantization_config=(
+            models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True)
+            )
+            if quantize
+            else None
+        ),
+    )
+    return True
 
 
-def build_embeddings() -> Tuple[HuggingFaceEmbeddings, FastEmbedSparse]:
-    dense = HuggingFaceEmbeddings(model_name="ai-forever/FRIDA")
+def indexing_disabled(client: QdrantClient, collection_name: str) -> bool:
+    # Left behind by a bulk upload that never reached restore_indexing
+    config = client.get_collection(collection_name=collection_name).config
+    return config.hnsw_config.m == 0 or config.optimizer_config.indexing_threshold == 0
+
+
+def restore_indexing(client: QdrantClient, collection_name: str) -> None:
+    client.update_collection(
+        collection_name=collection_name,
+        hnsw_config=models.HnswConfigDiff(m=HNSW_M),
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=INDEXING_THRESHOLD),
+    )
+
+
+def wait_for_index(client: QdrantClient, collection_name: str, timeout: float = INDEX_BUILD_TIMEOUT) -> None:
+    logger.info("Building HNSW index...")
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get_collection(collection_name=collection_name).status
+        if status == models.CollectionStatus.GREEN:
+            return
+        if status == models.CollectionStatus.RED:
+            raise RuntimeError(f"Collection '{collection_name}' is red after re-enabling indexing")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Collection '{collection_name}' is still {status} after {timeout:.0f}s of index building")
+        time.sleep(INDEX_POLL_INTERVAL)
+
+
+def resolve_device(device: str) -> torch.device:
+    if device == "auto":
+        return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    return torch.device(device)
+
+
+def resolve_dtype(dtype: str, device: torch.device) -> torch.dtype:
+    if dtype == "auto":
+        # bf16 keeps fp32's exponent range; fp16 can overflow in T5-based encoders such as FRIDA
+        if device.type == "cuda" and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return torch.float32
+    return DTYPES[dtype]
+
+
+class DenseEncoder:
+    """FRIDA encoder (T5 encoder, CLS pooling, L2-normalized) split into a tokenize step and a GPU step.
+
+    tokenize() runs in the parse stage, so the fast tokenizer works while the GPU is busy and each
+    text is tokenized exactly once. On CUDA its tensors are pinned, and embed() copies each
+    sub-batch on a side stream while the previous one runs; results are copied back without
+    blocking and the host waits only once per call.
+    """
+
+    def __init__(
+        self, device: torch.device, dtype: torch.dtype, batch_size: int = DENSE_BATCH_SIZE, compiled: bool = False
+    ) -> None:
+        self.device = device
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(DENSE_MODEL_NAME, use_fast=True)
+        self.model = T5EncoderModel.from_pretrained(DENSE_MODEL_NAME, torch_dtype=dtype).to(device).eval()
+        self.dimension = self.model.config.d_model
+        self.copy_stream = torch.cuda.Stream(device) if device.type == "cuda" else None
+        # Compiled graphs are specialized per input shape, so every sub-batch is padded to batch_size
+        # rows and one of a few bucket lengths
+        self.compiled = compiled
+        if compiled:
+            self.model = torch.compile(self.model, mode="reduce-overhead")
+
+    def tokenize(self, texts: List[str]) -> Tuple[List[Dict[str, torch.Tensor]], List[int]]:
+        # Sub-batches of similar length waste little compute on padding; character length
+        # is a close enough proxy for token length and needs no extra tokenizer pass
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = []
+        for start in range(0, len(order), self.batch_size):
+            encoded = self.tokenizer(
+                [texts[i] for i in order[start : start + self.batch_size]],
+                padding=True,
+                truncation=True,
+                max_length=DENSE_MAX_LENGTH,
+                return_tensors="pt",
+            )
+            batch = {name: encoded[name] for name in ("input_ids", "attention_mask")}
+            if self.compiled:
+                rows, width = batch["input_ids"].shape
+                extra = next(length for length in PADDING_BUCKETS if length >= width) - width
+                # Filler rows are fully masked; embed() drops their vectors
+                padding = (0, extra, 0, self.batch_size - rows)
+                batch = {
+                    "input_ids": F.pad(batch["input_ids"], padding, value=self.tokenizer.pad_token_id),
+                    "attention_mask": F.pad(batch["attention_mask"], padding, value=0),
+                }
+            if self.copy_stream is not None:
+                batch = {name: tensor.pin_memory() for name, tensor in batch.items()}
+            batches.append(batch)
+        return batches, order
+
+    def to_device(self, batch: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        if self.copy_stream is None:
+            return {name: tensor.to(self.device) for name, tensor in batch.items()}
+        with torch.cuda.stream(self.copy_stream):
+            return {name: tensor.to(self.device, non_blocking=True) for name, tensor in batch.items()}
+
+    def embed(self, tokenized: Tuple[List[Dict[str, torch.Tensor]], List[int]]) -> List[List[float]]:
+        batches, order = tokenized
+        if not batches:
+            return []
+        outputs: List[torch.Tensor] = []
+        with torch.inference_mode():
+            pending = self.to_device(batches[0])
+            for index in range(len(batches)):
+                inputs = pending
+                if self.copy_stream is not None:
+                    compute_stream = torch.cuda.current_stream(self.device)
+                    compute_stream.wait_stream(self.copy_stream)
+                    for tensor in inputs.values():
+                        tensor.record_stream(compute_stream)
+
+                if self.compiled:
+                    # Each forward pass is a new step for CUDA graph replay
+                    torch.compiler.cudagraph_mark_step_begin()
+                hidden = self.model(**inputs).last_hidden_state
+                rows = min(self.batch_size, len(order) - index * self.batch_size)
+                vectors = F.normalize(hidden[:rows, 0].float(), p=2, dim=-1)
+                outputs.append(vectors.to("cpu", non_blocking=True))
+
+                # The forward pass above is queued on the GPU; start copying the next sub-batch meanwhile
+                if index + 1 < len(batches):
+                    pending = self.to_device(batches[index + 1])
+
+            if self.device.type == "cuda":
+                torch.cuda.synchronize(self.device)
+        # Back from length order to input order
+        vectors = torch.empty((len(order), self.dimension))
+        vectors[order] = torch.cat(outputs)
+        return vectors.tolist()
+
+
+def build_embeddings(device: str, dtype: str, compiled: bool) -> Tuple[DenseEncoder, FastEmbedSparse]:
+    dense_device = resolve_device(device)
+    dense = DenseEncoder(dense_device, resolve_dtype(dtype, dense_device), compiled=compiled)
+    # BM25 stays in this process: FastEmbed's parallel mode starts a new worker pool on every
+    # embed call, which costs far more than encoding one upload batch, and the embed stage
+    # already overlaps BM25 with parsing and upserts
     sparse = FastEmbedSparse(model_name="Qdrant/bm25")
     return dense, sparse
 
 
-def upload(
-    file_path: str,
+class VectorCache:
+    """LRU of (dense, sparse) vectors keyed by a digest of the article text.
+
+    The parse stage claims digests in upload order and tokenizes only texts it has not seen;
+    the embed stage sees batches in the same order, so by the time a repeat reaches it the
+    first copy's vectors are stored. Entries used by batches still in flight were touched
+    recently and are never the ones evicted.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.entries: OrderedDict[bytes, Tuple[array, array, array] | None] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def claim(self, digest: bytes) -> bool:
+        """Return True if the text is new and has to be embedded."""
+        if self.capacity <= 0:
+            return True
+        with self.lock:
+            if digest in self.entries:
+                self.entries.move_to_end(digest)
+                return False
+            self.entries[digest] = None
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+            return True
+
+    def store(self, digest: bytes, dense: List[float], sparse: SparseVector) -> None:
+        with self.lock:
+            if digest in self.entries:
+                # Typed arrays: a fraction of the memory of lists of Python ints and floats
+                self.entries[digest] = (array("f", dense), array("I", sparse.indices), array("f", sparse.values))
+
+    def get(self, digest: bytes) -> Tuple[List[float], SparseVector]:
+        with self.lock:
+            dense, indices, values = self.entries[digest]
+        return dense.tolist(), SparseVector(indices=indices.tolist(), values=values.tolist())
+
+
+def put_until_stopped(q: queue.Queue, item: object, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def get_until_stopped(q: queue.Queue, stop: threading.Event) -> object:
+    # Returns None (end of stream) once the pipeline has been stopped and the queue is drained
+    while True:
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+def upload_many(
+    file_paths: List[str],
     collection_name: str,
     qdrant_url: str,
     qdrant_api_key: str | None,
     batch_size: int,
     append: bool,
     limit: int | None,
+    bulk_mode: bool = True,
+    device: str = "auto",
+    dtype: str = "auto",
+    compiled: bool = False,
+    quantize: bool = True,
+    segments: int | None = DEFAULT_SEGMENTS,
+    optimization_threads: int | None = None,
+    cache_size: int = EMBEDDING_CACHE_SIZE,
 ) -> None:
-    source_file = os.path.basename(file_path)
-    file_stem = Path(file_path).stem
-
-    client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key)
-    ensure_collection(client, collection_name, append=append)
-
-    dense_embeddings, sparse_embeddings = build_embeddings()
+    dense_embeddings, sparse_embeddings = build_embeddings(device, dtype, compiled)
+    dense_size = dense_embeddings.dimension
+
+    # One gRPC channel for collection management and every upsert; large batches of 1024-dim vectors
+    # exceed gRPC's default 4 MB message limit
+    client = QdrantClient(
+        url=qdrant_url,
+        api_key=qdrant_api_key,
+        prefer_grpc=True,
+        grpc_options={
+            "grpc.max_send_message_length": GRPC_MAX_MESSAGE_LENGTH,
+            "grpc.max_receive_message_length": GRPC_MAX_MESSAGE_LENGTH,
+        },
+    )
+    created = ensure_collection(
+        client,
+        collection_name,
+        append=append,
+        dense_size=dense_size,
+        bulk_mode=bulk_mode,
+        quantize=quantize,
+        segments=segments,
+        optimization_threads=optimization_threads,
+    )
 
-    # We'll initialize the store on the first batch using from_texts, then add_texts for subsequent batches
-    store: QdrantVectorStore | None = None
+    # Digests claimed by the parse stage are read back at most PIPELINE_QUEUE_SIZE + 2 batches later,
+    # so the cache must hold at least that many entries to never evict one still needed
+    vector_cache = VectorCache(max(cache_size, (PIPELINE_QUEUE_SIZE + 2) * batch_size) if cache_size > 0 else 0)
+
+    # Three stages connected by small bounded queues: parse -> embed -> upsert.
+    # Each stage works on its own batch, so reading, embedding and network I/O overlap.
+    parse_q: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    embed_q: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def parse_stage() -> None:
+        try:
+            for chunk in chunks(interleave_articles(file_paths, limit=limit), batch_size):
+                sources, positions, metas, chunk_texts = zip(*chunk)
+                texts: List[str] = list(chunk_texts)
+                # Ids depend only on the file and the article's position in it, so re-uploading
+                # with --append overwrites points in place and no id counter has to be read first
+                ids = [
+                    str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source}:{position}"))
+                    for source, position in zip(sources, positions)
+                ]
+                metadatas = [{**meta, "source_file": source} for meta, source in zip(metas, sources)]
+                # Only the first copy of a repeated article body is tokenized and embedded
+                digests = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts]
+                novel = [index for index, digest in enumerate(digests) if vector_cache.claim(digest)]
+                encodings = dense_embeddings.tokenize([texts[index] for index in novel])
+
+                if not put_until_stopped(parse_q, (texts, digests, novel, encodings, metadatas, ids), stop):
+                    return
+            put_until_stopped(parse_q, None, stop)
+        except BaseException:
+            stop.set()
+            raise
+
+    def embed_stage() -> None:
+        try:
+            while (item := get_until_stopped(parse_q, stop)) is not None:
+                texts, digests, novel, encodings, metadatas, ids = item
+                dense_vectors: List[List[float] | None] = [None] * len(texts)
+                sparse_vectors: List[SparseVector | None] = [None] * len(texts)
+                if novel:
+                    novel_dense = dense_embeddings.embed(encodings)
+                    novel_sparse = sparse_embeddings.embed_documents([texts[index] for index in novel])
+                    for index, dense, sparse in zip(novel, novel_dense, novel_sparse):
+                        dense_vectors[index] = dense
+                        sparse_vectors[index] = sparse
+                        vector_cache.store(digests[index], dense, sparse)
+                for index, digest in enumerate(digests):
+                    if dense_vectors[index] is None:
+                        dense_vectors[index], sparse_vectors[index] = vector_cache.get(digest)
+                if not put_until_stopped(embed_q, (texts, dense_vectors, sparse_vectors, metadatas, ids), stop):
+                    return
+            put_until_stopped(embed_q, None, stop)
+        except BaseException:
+            stop.set()
+            raise
 
     total_uploaded = 0
-    article_index = 0
-
-    # Determine starting integer ID
-    next_point_id = 1
+    last_progress = time.monotonic()
+    # An interrupted bulk upload must not leave indexing off: restore it on every exit path, and
+    # pick up collections a previous aborted run left with m=0 when appending to them
+    rebuild_index = (bulk_mode and created) or (not created and indexing_disabled(client, collection_name))
+    # Each batch is sent once the next one is ready; the final batch goes with wait=True, and since
+    # Qdrant applies updates in order, its acknowledgement covers every batch before it
+    pending: List[models.PointStruct] = []
     try:
-        if append and client.collection_exists(collection_name=collection_name):
-            count_result = client.count(collection_name=collection_name, exact=False)
-            # Fallback to 0 if count_result is missing for any reason
-            current_count = getattr(count_result, "count", 0) or 0
-            next_point_id = int(current_count) + 1
-    except Exception:
-        # If counting fails, start from 1
-        next_point_id = 1
-
-    for batch in batch_iterable(iterate_articles(file_path, limit=limit), batch_size=batch_size):
-        texts: List[str] = []
-        metadatas: List[Dict[str, str]] = []
-        ids: List[int] = []
-
-        for meta, text in batch:
-            article_index += 1
-            # Derive an id that is stable and informative
-            number = meta.get("article_number") or meta.get("law_number") or str(article_index)
-            article_uid = f"{file_stem}-art-{number}-{article_index}"
-
-            meta_with_common = dict(meta)
-            meta_with_common["source_file"] = source_file
-            meta_with_common["article_uid"] = article_uid
-
-            texts.append(text)
-            metadatas.append(meta_with_common)
-            ids.append(next_point_id)
-            next_point_id += 1
-
-        if not texts:
-            continue
-
-        if store is None:
-            store = QdrantVectorStore.from_texts(
-                texts=texts,
-                embedding=dense_embeddings,
-                sparse_embedding=sparse_embeddings,
-                url=qdrant_url,
-                api_key=qdrant_api_key,
-                collection_name=collection_name,
-                retrieval_mode=RetrievalMode.HYBRID,
-                vector_name="dense",
-                sparse_vector_name="sparse",
-                metadatas=metadatas,
-                ids=ids,
-            )
-        else:
-            store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
-
-        total_uploaded += len(texts)
-        print(f"Uploaded batch: {len(texts)} | Total: {total_uploaded}")
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="upload") as executor:
+            workers = [executor.submit(parse_stage), executor.submit(embed_stage)]
+            try:
+                while (item := get_until_stopped(embed_q, stop)) is not None:
+                    texts, dense_vectors, sparse_vectors, metadatas, ids = item
+                    points = [
+                        models.PointStruct(
+                            id=point_id,
+                            vector={
+                                DENSE_VECTOR_NAME: dense,
+                                SPARSE_VECTOR_NAME: models.SparseVector(indices=sparse.indices, values=sparse.values),
+                            },
+                            payload={CONTENT_PAYLOAD_KEY: text, METADATA_PAYLOAD_KEY: meta},
+                        )
+                        for point_id, text, dense, sparse, meta in zip(ids, texts, dense_vectors, sparse_vectors, metadatas)
+                    ]
+                    if pending:
+                        # wait=False returns once the batch is accepted, so the next one can be sent while Qdrant writes this one
+                        client.upsert(collection_name=collection_name, points=pending, wait=False)
+                    pending = points
+
+                    total_uploaded += len(texts)
+                    logger.debug("Uploaded batch: %d | Total: %d", len(texts), total_uploaded)
+                    now = time.monotonic()
+                    if now - last_progress >= PROGRESS_INTERVAL:
+                        logger.info("Uploaded %d items", total_uploaded)
+                        last_progress = now
+            finally:
+                stop.set()
+            for worker in workers:
+                worker.result()
+        if pending:
+            client.upsert(collection_name=collection_name, points=pending, wait=True)
+    finally:
+        if rebuild_index:
+            restore_indexing(client, collection_name)
+    if rebuild_index:
+        wait_for_index(client, collection_name)
 
     print(f"Done. Uploaded {total_uploaded} items into collection '{collection_name}'.")
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Upload legal articles/laws into Qdrant (HYBRID mode)")
-    parser.add_argument("--file", required=True, help="Path to input file or name under output/")
-    parser.add_argument("--collection", default=None, help="Qdrant collection name (default: file name stem)")
+    parser.add_argument(
+        "--file",
+        required=True,
+        nargs="+",
+        help="Path to input file or name under output/; several files are interleaved into one collection",
+    )
+    parser.add_argument(
+        "--collection", default=None, help="Qdrant collection name (default: file name stem; required for several files)"
+    )
     parser.add_argument("--qdrant-url", default="http://127.0.0.1:6333", help="Qdrant URL")
     parser.add_argument("--qdrant-api-key", default=None, help="Qdrant API key")
     parser.add_argument("--batch-size", type=int, default=256, help="Upload batch size")
     parser.add_argument("--append", action="store_true", help="Append to existing collection instead of dropping it")
     parser.add_argument("--limit", type=int, default=None, help="Limit number of articles to upload (testing)")
+    parser.add_argument(
+        "--bulk-mode",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip HNSW indexing while uploading into a new collection and build the index once at the end",
+    )
+    parser.add_argument(
+        "--quantization",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Create the collection with int8 scalar quantization kept in RAM and original dense vectors on disk",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=DEFAULT_SEGMENTS,
+        help=f"default_segment_number for a new collection (default: {DEFAULT_SEGMENTS}, favours throughput)",
+    )
+    parser.add_argument(
+        "--optimization-threads",
+        type=int,
+        default=None,
+        help="max_optimization_threads for a new collection (default: chosen by the server)",
+    )
+    parser.add_argument(
+        "--device",
+        default="auto",
+        help="Torch device for FRIDA, e.g. cuda, cuda:1 or cpu (auto: cuda when available)",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=["auto", *DTYPES],
+        default="auto",
+        help="FRIDA inference precision (auto: bfloat16 on GPUs that support it, else float32; float16 may overflow)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=EMBEDDING_CACHE_SIZE,
+        help=f"Distinct article bodies kept to skip re-embedding repeats, ~10 KB each (0 disables; default: {EMBEDDING_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="torch.compile the FRIDA encoder (warm-up cost per padding bucket; pays off on long uploads)",
+    )
 
     args = parser.parse_args()
-
-    file_path = resolve_input_file_path(args.file)
-    collection_name = args.collection or Path(file_path).stem
-
-    upload(
-        file_path=file_path,
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    file_paths = [resolve_input_file_path(path) for path in args.file]
+    if args.collection is None and len(file_paths) > 1:
+        parser.error("--collection is required when uploading several files")
+    # Point ids and source_file come from the file name alone, so two inputs sharing it would collide
+    names = [os.path.basename(path) for path in file_paths]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        parser.error(f"several input files are named {', '.join(duplicates)}; their point ids would collide")
+    collection_name = args.collection or Path(file_paths[0]).stem
+
+    upload_many(
+        file_paths=file_paths,
         collection_name=collection_name,
         qdrant_url=args.qdrant_url,
         qdrant_api_key=args.qdrant_api_key,
         batch_size=args.batch_size,
         append=args.append,
         limit=args.limit,
+        bulk_mode=args.bulk_mode,
+        device=args.device,
+        dtype=args.dtype,
+        compiled=args.compile,
+        quantize=args.quantization,
+        segments=args.segments,
+        optimization_threads=args.optimization_threads,
+        cache_size=args.cache_size,
     )
 
 